@@ -5,14 +5,12 @@ __license__ = "MIT"
 
 import os
 import subprocess
-import glob
 from argparse import ArgumentError, ArgumentDefaultsHelpFormatter
 import logging as _logging
 import re
 import sys
 import inspect
 import threading
-import webbrowser
 from functools import partial
 import importlib
 import shutil
@@ -2678,6 +2676,8 @@ def main(argv=None):
         print("Listening on {}.".format(url), file=sys.stderr)
 
         def open_browser():
+            import webbrowser
+
             try:
                 webbrowser.open(url)
             except:
@@ -2931,6 +2931,8 @@ def bash_completion(snakefile="Snakefile"):
             if action.option_strings and action.option_strings[0].startswith(prefix)
         )
     else:
+        import glob
+
         candidates = []
         files = glob.glob("{}*".format(prefix))
         if files:
@@ -242,6 +242,33 @@ def group_into_chunks(n, iterable):
         yield chunk
 
 
+def toposort(graph):
+    """Sort the given graph topologically.
+
+    The graph has to be a dict mapping each node to the set of its dependencies.
+    Yields sets of nodes that only depend on nodes yielded before.
+    Uses the graphlib module of the standard library if available
+    (Python >= 3.9), and the toposort package otherwise.
+    """
+    try:
+        from graphlib import TopologicalSorter
+    except ImportError:
+        from toposort import toposort as _toposort
+
+        yield from _toposort(graph)
+        return
+
+    # like toposort, ignore self dependencies
+    sorter = TopologicalSorter(
+        {node: deps - {node} if node in deps else deps for node, deps in graph.items()}
+    )
+    sorter.prepare()
+    while sorter.is_active():
+        ready = sorter.get_ready()
+        yield set(ready)
+        sorter.done(*ready)
+
+
 class Rules:
     """A namespace for rules so that they can be accessed via dot notation."""
 
@@ -0,0 +1,126 @@
+__authors__ = "Johannes Köster"
+__copyright__ = "Copyright 2021, Johannes Köster"
+__email__ = "johannes.koester@uni-due.de"
+__license__ = "MIT"
+
+import hashlib
+import marshal
+import os
+from functools import lru_cache
+from importlib.util import MAGIC_NUMBER
+
+import snakemake.parser
+from snakemake.common import __version__
+from snakemake.logging import logger
+from snakemake.parser import parse
+from snakemake.sourcecache import LocalSourceFile
+
+
+@lru_cache()
+def _parser_checksum():
+    """Checksum of the Snakemake parser, which determines the compiled code
+    of a snakefile (the version alone does not change in a source checkout).
+    Returns None if the source of the parser is not available.
+    """
+    try:
+        with open(snakemake.parser.__file__, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class CompilationCache:
+    """Cache of compiled snakefiles, such that unchanged snakefiles do not
+    have to be parsed again in the next run.
+
+    There is one entry per snakefile, rule count and overwritten shell
+    command, such that entries of outdated versions of a snakefile are
+    replaced instead of accumulating.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def compile(self, snakefile, workflow, print_compilation=False):
+        """Parse the given snakefile and compile it into a code object.
+
+        Only local snakefiles are cached. Returns the code, the linemap and
+        the rule count after the snakefile.
+        """
+        entry = key = None
+        if isinstance(snakefile, LocalSourceFile) and not print_compilation:
+            entry, key = self._entry(snakefile, workflow)
+            if entry is not None:
+                try:
+                    with open(entry, "rb") as cached:
+                        cached_key, code, linemap, rulecount = marshal.load(cached)
+                    if cached_key == key:
+                        return code, linemap, rulecount
+                except (OSError, EOFError, ValueError, TypeError):
+                    # not yet cached or invalid cache entry
+                    pass
+
+        code, linemap, rulecount = parse(
+            snakefile,
+            workflow,
+            overwrite_shellcmd=workflow.overwrite_shellcmd,
+            rulecount=workflow._rulecount,
+        )
+
+        if print_compilation:
+            print(code)
+
+        code = compile(code, snakefile.get_path_or_uri(), "exec")
+
+        if entry is not None:
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                # write to a temporary file first, such that concurrent
+                # snakemake processes never see a partially written entry
+                tmp_entry = "{}.{}.tmp".format(entry, os.getpid())
+                with open(tmp_entry, "wb") as cached:
+                    marshal.dump((key, code, linemap, rulecount), cached)
+                os.replace(tmp_entry, entry)
+            except OSError as e:
+                logger.debug(
+                    "Failed to cache compiled snakefile {}: {}".format(
+                        snakefile.get_path_or_uri(), e
+                    )
+                )
+        return code, linemap, rulecount
+
+    def _entry(self, snakefile, workflow):
+        """Return the path of the cache entry of the given local snakefile and
+        the key it has to be stored with, or (None, None) if the snakefile or
+        the parser source cannot be read.
+
+        The key covers the content of the snakefile and the Snakemake parser,
+        and the Python bytecode version.
+        """
+        parser_checksum = _parser_checksum()
+        if parser_checksum is None:
+            return None, None
+        path = snakefile.get_path_or_uri()
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None, None
+
+        entry = hashlib.sha256()
+        for item in (
+            path,
+            os.path.abspath(path),
+            str(workflow._rulecount),
+            repr(workflow.overwrite_shellcmd),
+        ):
+            entry.update(item.encode())
+            entry.update(b"\0")
+
+        key = hashlib.sha256()
+        for item in (__version__, parser_checksum, MAGIC_NUMBER.hex()):
+            key.update(item.encode())
+            key.update(b"\0")
+        key.update(content)
+
+        return os.path.join(self.path, entry.hexdigest()), key.hexdigest()
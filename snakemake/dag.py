@@ -35,6 +35,45 @@ from snakemake import workflow
 
 PotentialDependency = namedtuple("PotentialDependency", ["file", "jobs", "known"])
 
+# Maximum number of nested evaluations while building the DAG (two per level),
+# beyond which a cyclic dependency is assumed.
+MAX_DAG_DEPTH = 20000
+
+
+def _evaluate(generator, max_depth=MAX_DAG_DEPTH):
+    """Run the given generator, which yields generators whose results it
+    needs. These are run in turn, and their results (or exceptions) are sent
+    back into the generator that yielded them.
+
+    Thereby, nested evaluations use an explicit stack instead of recursion,
+    such that they are not limited by the recursion limit of Python.
+    """
+    stack = [generator]
+    value = exception = None
+    while stack:
+        try:
+            if exception is not None:
+                nested = stack[-1].throw(exception)
+            else:
+                nested = stack[-1].send(value)
+        except StopIteration as e:
+            stack.pop()
+            value, exception = e.value, None
+            continue
+        except Exception as e:
+            stack.pop()
+            value, exception = None, e
+            continue
+        value = exception = None
+        if len(stack) < max_depth:
+            stack.append(nested)
+        else:
+            nested.close()
+            exception = RecursionError("maximum depth of the DAG exceeded")
+    if exception is not None:
+        raise exception
+    return value
+
 
 class Batch:
     """Definition of a batch for calculating only a partial DAG."""
@@ -123,6 +162,8 @@ class DAG:
         self.keep_remote_local = keep_remote_local
         self._jobid = dict()
         self.job_cache = dict()
+        # jobs that failed with a MissingInputException while updating the DAG
+        self._missing_input_cache = dict()
         self.conda_envs = dict()
         self.container_imgs = dict()
         self._progress = 0
@@ -205,8 +246,15 @@ class DAG:
 
     def check_directory_outputs(self):
         """Check that no output file is contained in a directory output of the same or another rule."""
+        # os.path.abspath queries the working directory for every single
+        # file, hence resolve it once for all outputs
+        cwd = os.getcwd()
         outputs = sorted(
-            {(os.path.abspath(f), job) for job in self.jobs for f in job.output}
+            {
+                (os.path.normpath(os.path.join(cwd, f)), job)
+                for job in self.jobs
+                for f in job.output
+            }
         )
         for i in range(len(outputs) - 1):
             (a, job_a), (b, job_b) = outputs[i : i + 2]
@@ -247,6 +295,7 @@ class DAG:
 
     def cleanup(self):
         self.job_cache.clear()
+        self._missing_input_cache.clear()
         final_jobs = set(self.bfs(self.dependencies, *self.targetjobs))
         todelete = [job for job in self.dependencies if job not in final_jobs]
         for job in todelete:
@@ -726,8 +775,40 @@ class DAG:
         skip_until_dynamic=False,
         progress=False,
         create_inventory=False,
+        record_producer=False,
     ):
-        """Update the DAG by adding given jobs and their dependencies."""
+        """Update the DAG by adding given jobs and their dependencies.
+
+        If record_producer is True, the given jobs are all potential producers
+        of file (as obtained via file2jobs), such that the selected one may be
+        reused for other jobs requesting the same file.
+        """
+        return _evaluate(
+            self._update(
+                jobs,
+                file=file,
+                visited=visited,
+                known_producers=known_producers,
+                skip_until_dynamic=skip_until_dynamic,
+                progress=progress,
+                create_inventory=create_inventory,
+                record_producer=record_producer,
+            )
+        )
+
+    def _update(
+        self,
+        jobs,
+        file=None,
+        visited=None,
+        known_producers=None,
+        skip_until_dynamic=False,
+        progress=False,
+        create_inventory=False,
+        record_producer=False,
+    ):
+        """Generator implementing update(), which yields the evaluations of
+        the given jobs (see _evaluate)."""
         if visited is None:
             visited = set()
         if known_producers is None:
@@ -755,11 +836,17 @@ class DAG:
             if job in visited:
                 cycles.append(job)
                 continue
+            if job in self._missing_input_cache:
+                # The job has already been tried via another path and its input
+                # cannot be provided, hence skip the evaluation of its subtree.
+                exceptions.append(self._missing_input_cache[job])
+                discarded_jobs.add(job)
+                continue
             try:
                 self.check_periodic_wildcards(job)
-                self.update_(
+                yield self._update_(
                     job,
-                    visited=set(visited),
+                    visited=visited,
                     known_producers=known_producers,
                     skip_until_dynamic=skip_until_dynamic,
                     progress=progress,
@@ -776,6 +863,8 @@ class DAG:
                 PeriodicWildcardError,
                 WorkflowError,
             ) as ex:
+                if isinstance(ex, MissingInputException):
+                    self._missing_input_cache[job] = ex
                 exceptions.append(ex)
                 discarded_jobs.add(job)
             except RecursionError as e:
@@ -814,6 +903,16 @@ class DAG:
         if ambiguities and not self.ignore_ambiguity:
             raise AmbiguousRuleException(file, producer, ambiguities[0])
         logger.dag_debug(dict(status="selected", job=producer))
+        if (
+            record_producer
+            and file is not None
+            and not cycles
+            and not skip_until_dynamic
+            and all(isinstance(ex, MissingInputException) for ex in exceptions)
+        ):
+            # The selection did not depend on the path via which the file was
+            # requested, hence other jobs requesting it can reuse the producer.
+            known_producers[file] = [producer]
         logger.dag_debug(
             dict(
                 file=file,
@@ -833,6 +932,32 @@ class DAG:
         create_inventory=False,
     ):
         """Update the DAG by adding the given job and its dependencies."""
+        _evaluate(
+            self._update_(
+                job,
+                visited=visited,
+                known_producers=known_producers,
+                skip_until_dynamic=skip_until_dynamic,
+                progress=progress,
+                create_inventory=create_inventory,
+            )
+        )
+
+    def _update_(
+        self,
+        job,
+        visited=None,
+        known_producers=None,
+        skip_until_dynamic=False,
+        progress=False,
+        create_inventory=False,
+    ):
+        """Generator implementing update_(), which yields the evaluations of
+        the potential producers of the input files (see _evaluate).
+
+        Visited contains the jobs on the path to the given job. The job is
+        added for the evaluation of its dependencies and removed afterwards.
+        """
         if job in self.dependencies:
             return
         if visited is None:
@@ -840,6 +965,28 @@ class DAG:
         if known_producers is None:
             known_producers = dict()
         visited.add(job)
+        try:
+            yield from self._update_dependencies(
+                job,
+                visited=visited,
+                known_producers=known_producers,
+                skip_until_dynamic=skip_until_dynamic,
+                progress=progress,
+                create_inventory=create_inventory,
+            )
+        finally:
+            visited.discard(job)
+
+    def _update_dependencies(
+        self,
+        job,
+        visited,
+        known_producers,
+        skip_until_dynamic=False,
+        progress=False,
+        create_inventory=False,
+    ):
+        """Add the given job and the producers of its input files to the DAG."""
         dependencies = self.dependencies[job]
         potential_dependencies = self.collect_potential_dependencies(
             job, known_producers=known_producers
@@ -872,7 +1019,7 @@ class DAG:
                 producer[res.file] = res.jobs[0]
             else:
                 try:
-                    selected_job = self.update(
+                    selected_job = yield self._update(
                         res.jobs,
                         file=res.file,
                         visited=visited,
@@ -880,6 +1027,9 @@ class DAG:
                         skip_until_dynamic=skip_until_dynamic
                         or res.file in job.dynamic_input,
                         progress=progress,
+                        # producers given by an explicit rule dependency
+                        # are specific to this job
+                        record_producer=res.file not in job.dependencies,
                     )
                     producer[res.file] = selected_job
                 except (
@@ -1008,7 +1158,9 @@ class DAG:
         _needrun.clear()
         _n_until_ready.clear()
         self._ready_jobs.clear()
-        candidates = list(self.jobs)
+        # the keys view of the dependencies is iterated directly, it is not
+        # modified while updating the needrun information
+        candidates = self.jobs
 
         # Update the output mintime of all jobs.
         # We traverse them in BFS (level order) starting from target jobs.
@@ -1024,7 +1176,6 @@ class DAG:
 
         queue = deque(filter(reason, candidates))
         visited = set(queue)
-        candidates_set = set(candidates)
         while queue:
             job = queue.popleft()
             _needrun.add(job)
@@ -1037,7 +1188,7 @@ class DAG:
                     queue.append(job_)
 
             for job_, files in depending[job].items():
-                if job_ in candidates_set:
+                if job_ in dependencies:
                     if job_ not in visited:
                         # TODO may it happen that order determines whether
                         # _n_until_ready is incremented for this job?
@@ -1378,6 +1529,8 @@ class DAG:
             jobs = [job]
 
         self._finished.update(jobs)
+        for job_ in jobs:
+            job_.release()
 
         updated_dag = False
         if update_dynamic:
@@ -1598,21 +1751,25 @@ class DAG:
             if file in job.subworkflow_input:
                 continue
 
+            if file in known_producers:
+                known = known_producers[file]
+                # explicit rule dependencies take precedence over a producer
+                # that has been selected for another job
+                if not known or file not in job.dependencies:
+                    yield PotentialDependency(file, known, True)
+                    continue
             try:
-                yield PotentialDependency(file, known_producers[file], True)
-            except KeyError:
-                try:
-                    if file in job.dependencies:
-                        yield PotentialDependency(
-                            file,
-                            [self.new_job(job.dependencies[file], targetfile=file)],
-                            False,
-                        )
-                    else:
-                        yield PotentialDependency(file, file2jobs(file), False)
-                except MissingRuleException as ex:
-                    # no dependency found
-                    yield PotentialDependency(file, None, False)
+                if file in job.dependencies:
+                    yield PotentialDependency(
+                        file,
+                        [self.new_job(job.dependencies[file], targetfile=file)],
+                        False,
+                    )
+                else:
+                    yield PotentialDependency(file, file2jobs(file), False)
+            except MissingRuleException as ex:
+                # no dependency found
+                yield PotentialDependency(file, None, False)
 
     def bfs(self, direction, *jobs, stop=lambda job: False):
         """Perform a breadth-first traversal of the DAG."""
@@ -1629,45 +1786,6 @@ class DAG:
                     queue.append(job_)
                     visited.add(job_)
 
-    def level_bfs(self, direction, *jobs, stop=lambda job: False):
-        """Perform a breadth-first traversal of the DAG, but also yield the
-        level together with each job."""
-        queue = [(job, 0) for job in jobs]
-        visited = set(jobs)
-        while queue:
-            job, level = queue.pop(0)
-            if stop(job):
-                # stop criterion reached for this node
-                continue
-            yield level, job
-            level += 1
-            for job_, _ in direction[job].items():
-                if not job_ in visited:
-                    queue.append((job_, level))
-                    visited.add(job_)
-
-    def dfs(self, direction, *jobs, stop=lambda job: False, post=True):
-        """Perform depth-first traversal of the DAG."""
-        visited = set()
-
-        def _dfs(job):
-            """Inner function for DFS traversal."""
-            if stop(job):
-                return
-            if not post:
-                yield job
-            for job_ in direction[job]:
-                if not job_ in visited:
-                    visited.add(job_)
-                    for j in _dfs(job_):
-                        yield j
-            if post:
-                yield job
-
-        for job in jobs:
-            for job_ in self._dfs(direction, job, visited, stop=stop, post=post):
-                yield job_
-
     def new_wildcards(self, job):
         """Return wildcards that are newly introduced in this job,
         compared to its ancestors."""
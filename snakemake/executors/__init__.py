@@ -397,13 +397,9 @@ class TouchExecutor(RealExecutor):
         super().handle_job_success(job, ignore_missing_output=True)
 
 
+# Jobs are run in a ThreadPoolExecutor, hence a BrokenProcessPool cannot occur.
+# Importing it would pull in multiprocessing on every startup.
 _ProcessPoolExceptions = (KeyboardInterrupt,)
-try:
-    from concurrent.futures.process import BrokenProcessPool
-
-    _ProcessPoolExceptions = (KeyboardInterrupt, BrokenProcessPool)
-except ImportError:
-    pass
 
 
 class CPUExecutor(RealExecutor):
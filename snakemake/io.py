@@ -5,6 +5,7 @@ __license__ = "MIT"
 
 import collections
 import os
+import sys
 import shutil
 from pathlib import Path
 import re
@@ -135,7 +136,7 @@ class IOCache:
     def mtime_inventory(self, jobs):
         async_run(self._mtime_inventory(jobs))
 
-    async def _mtime_inventory(self, jobs, n_workers=8):
+    async def _mtime_inventory(self, jobs, n_workers=8, batch_size=100):
         queue = asyncio.Queue()
         stop_item = object()
 
@@ -146,7 +147,11 @@ class IOCache:
                     queue.task_done()
                     return
                 try:
-                    self.mtime[item] = await self.collect_mtime(item)
+                    if isinstance(item, tuple):
+                        # local files sharing the same parent directory
+                        self.mtime.update(await self.collect_local_mtimes(*item))
+                    else:
+                        self.mtime[item] = await self.collect_mtime(item)
                 except Exception as e:
                     queue.task_done()
 
@@ -158,12 +163,28 @@ class IOCache:
             for _ in range(n_workers)
         ]
 
+        # files are usually shared between jobs, make sure to stat each only once
+        seen = set()
+        # local files are grouped by their parent directory
+        local_files = collections.defaultdict(list)
+
+        def enqueue(f):
+            if f not in seen and f not in self.mtime and f.exists:
+                seen.add(f)
+                if f.is_remote:
+                    queue.put_nowait(f)
+                else:
+                    local_files[os.path.dirname(f.file)].append(f)
+
         for job in jobs:
             for f in chain(job.input, job.expanded_output):
-                if f.exists:
-                    queue.put_nowait(f)
-            if job.benchmark and job.benchmark.exists:
-                queue.put_nowait(job.benchmark)
+                enqueue(f)
+            if job.benchmark:
+                enqueue(job.benchmark)
+
+        for parent, files in local_files.items():
+            for i in range(0, len(files), batch_size):
+                queue.put_nowait((parent, files[i : i + batch_size]))
 
         # Send a stop item to each worker.
         for _ in range(n_workers):
@@ -174,6 +195,46 @@ class IOCache:
     async def collect_mtime(self, path):
         return path.mtime_uncached
 
+    async def collect_local_mtimes(self, parent, files):
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self._stat_local_files, parent, files
+        )
+
+    @staticmethod
+    def _stat_local_files(parent, files):
+        """Obtain the mtimes of the given local files in the directory parent.
+
+        The files are stat'ed relative to a file descriptor of their parent
+        directory, such that the path has to be resolved only once instead
+        of for each file. Symlinks and directories need more than one stat
+        call and are handled by mtime_uncached.
+        """
+        if os.stat not in os.supports_dir_fd:
+            return [(f, f.mtime_uncached) for f in files]
+        try:
+            dir_fd = os.open(parent or ".", os.O_RDONLY)
+        except OSError:
+            return [(f, f.mtime_uncached) for f in files]
+
+        mtimes = []
+        try:
+            for f in files:
+                try:
+                    _stat = os.stat(
+                        os.path.basename(f.file), dir_fd=dir_fd, follow_symlinks=False
+                    )
+                except OSError:
+                    # let mtime_uncached handle the error
+                    mtimes.append((f, f.mtime_uncached))
+                    continue
+                if stat.S_ISREG(_stat.st_mode):
+                    mtimes.append((f, Mtime(local=_stat.st_mtime)))
+                else:
+                    mtimes.append((f, f.mtime_uncached))
+        finally:
+            os.close(dir_fd)
+        return mtimes
+
     def clear(self):
         self.mtime.clear()
         self.size.clear()
@@ -217,6 +278,10 @@ class _IOFile(str):
                 stripped = AnnotatedString(stripped)
                 stripped.flags = file.flags
             file = stripped
+        elif type(file) is str:
+            # the same paths occur as output of one and input of other jobs,
+            # hence share a single copy of the string between all of them
+            file = sys.intern(file)
         obj = str.__new__(cls, file)
         obj._is_function = is_callable
         obj._file = file
@@ -869,7 +934,7 @@ def remove(file, remove_non_empty_dir=False):
             pass
 
 
-def regex(filepattern):
+def regex(filepattern, group_prefix=""):
     f = []
     last = 0
     wildcards = set()
@@ -882,11 +947,12 @@ def regex(filepattern):
                     "Constraint regex must be defined only in the first "
                     "occurence of the wildcard in a string."
                 )
-            f.append("(?P={})".format(wildcard))
+            f.append("(?P={}{})".format(group_prefix, wildcard))
         else:
             wildcards.add(wildcard)
             f.append(
-                "(?P<{}>{})".format(
+                "(?P<{}{}>{})".format(
+                    group_prefix,
                     wildcard,
                     match.group("constraint") if match.group("constraint") else ".+",
                 )
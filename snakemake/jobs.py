@@ -32,6 +32,7 @@ from snakemake.common import (
     lazy_property,
     get_uuid,
     TBDString,
+    toposort,
 )
 
 
@@ -261,6 +262,9 @@ class Job(AbstractJob):
     @property
     def params(self):
         if self._params is None:
+            if self.dag.finished(self):
+                # params have been released, see release()
+                logger.debug("Evaluating params of finished job {} again.".format(self))
             self._params = self.rule.expand_params(
                 self.wildcards_dict, self.input, self.output, self.resources
             )
@@ -315,6 +319,16 @@ class Job(AbstractJob):
         self._resources = None
         self._params = None
 
+    def release(self):
+        """Release information that is only needed for running the job.
+
+        Called once the job has finished. Params can be large (e.g. when
+        derived from input functions), hence finished jobs must not access
+        them anymore. If they do, params are evaluated again, which is
+        reported in the debug log.
+        """
+        self._params = None
+
     @property
     def conda_env_file(self):
         if self._conda_env_file is None:
@@ -1136,8 +1150,6 @@ class GroupJob(AbstractJob):
         self.jobs = self.jobs | other.jobs
 
     def finalize(self):
-        from toposort import toposort
-
         if self.toposorted is None:
 
             def get_dependencies(job):
@@ -633,11 +633,12 @@ def format_percentage(done, total):
         return "0%"
     precision = 0
     fraction = done / total
-    fmt_precision = "{{:.{}%}}".format
-    fmt = lambda fraction: fmt_precision(precision).format(fraction)
-    while fmt(fraction) == "100%" or fmt(fraction) == "0%":
+    formatted = "{:.0%}".format(fraction)
+    # each candidate precision is formatted only once
+    while formatted == "100%" or formatted == "0%":
         precision += 1
-    return fmt(fraction)
+        formatted = "{:.{}%}".format(fraction, precision)
+    return formatted
 
 
 logger = Logger()
@@ -10,18 +10,34 @@ class OutputIndex:
     def __init__(self, rules):
         import datrie
 
-        def prefixes(rule):
-            return (str(o.constant_prefix()) for o in rule.products)
+        # Products without wildcards are looked up directly by their path,
+        # only the remaining patterns have to be matched via the tries.
+        self.literal = dict()
+        patterns = list()
+        for rule in rules:
+            wildcard_products = list()
+            for o in rule.products:
+                if o.contains_wildcard():
+                    wildcard_products.append(o)
+                else:
+                    self.literal.setdefault(str(o.constant_prefix()), set()).add(rule)
+            if wildcard_products:
+                patterns.append((rule, wildcard_products))
 
-        def reverse_suffixes(rule):
-            return (str(o.constant_suffix())[::-1] for o in rule.products)
+        def prefixes(products):
+            return (str(o.constant_prefix()) for o in products)
+
+        def reverse_suffixes(products):
+            return (str(o.constant_suffix())[::-1] for o in products)
 
         def calc_trie(subpatterns):
-            t = datrie.Trie("".join(p for rule in rules for p in subpatterns(rule)))
+            t = datrie.Trie(
+                "".join(p for _, products in patterns for p in subpatterns(products))
+            )
             empty = list()
-            for rule in rules:
+            for rule, products in patterns:
                 has_empty = False
-                for p in subpatterns(rule):
+                for p in subpatterns(products):
                     if not p:
                         has_empty = True
                     if p not in t:
@@ -41,6 +57,10 @@ class OutputIndex:
 
         f = str(targetfile)
         hits = set(match_pattern(f, self.prefix_trie, self.empty_prefix))
-        return hits.intersection(
+        hits.intersection_update(
             match_pattern(f[::-1], self.suffix_trie, self.empty_suffix)
         )
+        literal_hits = self.literal.get(f)
+        if literal_hits:
+            hits.update(literal_hits)
+        return hits
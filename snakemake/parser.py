@@ -1194,16 +1194,12 @@ def parse(path, workflow, overwrite_shellcmd=None, rulecount=0):
         linemap = dict()
         compilation = list()
         for t, orig_token in automaton.consume():
-            l = lineno(orig_token)
-            linemap.update(
-                dict(
-                    (i, l)
-                    for i in range(
-                        snakefile.lines + 1, snakefile.lines + t.count("\n") + 1
-                    )
-                )
-            )
-            snakefile.lines += t.count("\n")
+            n = t.count("\n")
+            if n:
+                l = lineno(orig_token)
+                for i in range(snakefile.lines + 1, snakefile.lines + n + 1):
+                    linemap[i] = l
+                snakefile.lines += n
             compilation.append(t)
         compilation = "".join(format_tokens(compilation))
         if linemap:
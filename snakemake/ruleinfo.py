@@ -7,6 +7,38 @@ from copy import copy
 
 
 class RuleInfo:
+    __slots__ = (
+        "func",
+        "shellcmd",
+        "name",
+        "norun",
+        "input",
+        "output",
+        "params",
+        "message",
+        "benchmark",
+        "conda_env",
+        "container_img",
+        "is_containerized",
+        "env_modules",
+        "wildcard_constraints",
+        "threads",
+        "shadow_depth",
+        "resources",
+        "priority",
+        "version",
+        "log",
+        "docstring",
+        "group",
+        "script",
+        "notebook",
+        "wrapper",
+        "cwl",
+        "cache",
+        "path_modifier",
+        "handover",
+    )
+
     def __init__(self, func=None):
         self.func = func
         self.shellcmd = None
@@ -46,9 +78,11 @@ class RuleInfo:
         skips = set()
 
         if modifier.ruleinfo_overwrite:
-            for key, value in modifier.ruleinfo_overwrite.__dict__.items():
+            overwrite = modifier.ruleinfo_overwrite
+            for key in self.__slots__:
+                value = getattr(overwrite, key)
                 if key != "func" and value is not None:
-                    self.__dict__[key] = value
+                    setattr(self, key, value)
                     if key in prefix_replacables:
                         skips.add(key)
 
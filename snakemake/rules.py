@@ -37,6 +37,7 @@ from snakemake.io import (
     Log,
     Resources,
     strip_wildcard_constraints,
+    regex,
 )
 from snakemake.io import (
     apply_wildcards,
@@ -112,6 +113,7 @@ class Rule:
             self.basedir = None
             self.path_modifer = None
             self.ruleinfo = None
+            self._products_regex = None
         elif len(args) == 1:
             other = args[0]
             self.name = other.name
@@ -161,6 +163,7 @@ class Rule:
             self.basedir = other.basedir
             self.path_modifier = other.path_modifier
             self.ruleinfo = other.ruleinfo
+            self._products_regex = None
 
     def dynamic_branch(self, wildcards, input=True):
         def get_io(rule):
@@ -1060,6 +1063,10 @@ class Rule:
         """
         Returns True if this rule is a producer of the requested output.
         """
+        if self._products_regex is None:
+            self._products_regex = self._compile_products_regex()
+        if self._products_regex:
+            return self._products_regex.match(requested_output) is not None
         try:
             for o in self.products:
                 if o.match(requested_output):
@@ -1076,6 +1083,31 @@ class Rule:
                 "{}".format(ex), snakefile=self.snakefile, lineno=self.lineno
             )
 
+    def _compile_products_regex(self):
+        """
+        Combine the patterns of all products into a single regular expression,
+        such that is_producer needs only one match per requested file.
+        Returns False if this is not possible, e.g. because a wildcard
+        constraint is invalid or defines or refers to named groups itself.
+        The products are then matched one by one, which also reports invalid
+        patterns.
+        """
+        products = list(self.products)
+        if not products or any("(?P" in o.file for o in products):
+            # named groups of constraints would clash among the alternatives
+            return False
+        try:
+            return re.compile(
+                "|".join(
+                    # the group prefix keeps wildcard names unique
+                    # among the alternatives
+                    "(?:{})".format(regex(o.file, group_prefix="_p{}_".format(i)))
+                    for i, o in enumerate(products)
+                )
+            )
+        except (sre_constants.error, ValueError):
+            return False
+
     def get_wildcards(self, requested_output):
         """
         Return wildcard dictionary by matching regular expression
@@ -832,53 +832,36 @@ class JobScheduler:
             # each job is an item with one copy (0-1 MDKP)
             n = len(jobs)
             x = [0] * n  # selected jobs
-            E = set(range(n))  # jobs still free to select
-            u = [1] * n
+            E = list(range(n))  # jobs still free to select
             a = list(map(self.job_weight, jobs))  # resource usage of jobs
             c = list(map(self.job_reward, jobs))  # job rewards
-
-            def calc_reward():
-                return [c_j * y_j for c_j, y_j in zip(c, y)]
+            # only the resources that are requested by a job can limit its selection
+            a_requested = [
+                [(i, a_j_i) for i, a_j_i in enumerate(a_j) if a_j_i > 0] for a_j in a
+            ]
 
             b = [
                 self.resources[name] for name in self.global_resources
             ]  # resource capacities
 
-            while True:
+            while E:
                 # Step 2: compute effective capacities
-                y = [
-                    (
-                        min(
-                            (min(u[j], b_i // a_j_i) if a_j_i > 0 else u[j])
-                            for b_i, a_j_i in zip(b, a[j])
-                            if a_j_i
-                        )
-                        if j in E
-                        else 0
-                    )
-                    for j in range(n)
+                # With a single copy per job, the effective capacity
+                # min(1, b_i // a_j_i) is 1 exactly if the job fits into the
+                # remaining resources, hence a comparison is sufficient.
+                fitting = [
+                    j for j in E if all(a_j_i <= b[i] for i, a_j_i in a_requested[j])
                 ]
-                if not any(y):
+                if not fitting:
                     break
-                y = [
-                    (max(1, int(self.greediness * y_j)) if y_j > 0 else 0) for y_j in y
-                ]
 
-                # Step 3: compute rewards on cumulative sums
-                reward = calc_reward()
-                j_sel = max(E, key=reward.__getitem__)  # argmax
+                # Step 3: select the fitting job with the highest reward
+                j_sel = max(fitting, key=c.__getitem__)  # argmax
 
-                # Step 4: batch increment
-                y_sel = y[j_sel]
-
-                # Step 5: update information
-                x[j_sel] += y_sel
-                b = [b_i - (a_j_i * y_sel) for b_i, a_j_i in zip(b, a[j_sel])]
-                u[j_sel] -= y_sel
-                if not u[j_sel] or self.greediness == 1:
-                    E.remove(j_sel)
-                if not E:
-                    break
+                # Step 4 and 5: select the job and update information
+                x[j_sel] = 1
+                b = [b_i - a_j_i for b_i, a_j_i in zip(b, a[j_sel])]
+                E.remove(j_sel)
 
             solution = set(job for job, sel in zip(jobs, x) if sel)
             # update resources
@@ -6,17 +6,41 @@ __license__ = "MIT"
 import time
 import csv
 import json
-from collections import defaultdict
 
 import snakemake.jobs
 
 fmt_time = time.ctime
 
 
+class RuntimeStats:
+    """Running runtime statistics of the jobs of a rule."""
+
+    __slots__ = ["count", "total", "min", "max"]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, runtime):
+        self.count += 1
+        self.total += runtime
+        if runtime < self.min:
+            self.min = runtime
+        if runtime > self.max:
+            self.max = runtime
+
+    @property
+    def mean(self):
+        return self.total / self.count
+
+
 class Stats:
     def __init__(self):
         self.starttime = dict()
         self.endtime = dict()
+        self._rule_runtimes = dict()
 
     def report_job_start(self, job):
         if job.is_group():
@@ -28,17 +52,26 @@ class Stats:
     def report_job_end(self, job):
         if job.is_group():
             for j in job:
-                self.endtime[j] = time.time()
+                self._report_end(j, time.time())
         else:
-            self.endtime[job] = time.time()
+            self._report_end(job, time.time())
+
+    def _report_end(self, job, endtime):
+        self.endtime[job] = endtime
+        starttime = self.starttime.get(job)
+        if starttime is None:
+            return
+        # accumulate the runtime statistics of the rule as jobs finish
+        try:
+            runtimes = self._rule_runtimes[job.rule]
+        except KeyError:
+            runtimes = self._rule_runtimes[job.rule] = RuntimeStats()
+        runtimes.add(endtime - starttime)
 
     @property
     def rule_stats(self):
-        runtimes = defaultdict(list)
-        for job, t in self.starttime.items():
-            runtimes[job.rule].append(self.endtime[job] - t)
-        for rule, runtimes in runtimes.items():
-            yield (rule, sum(runtimes) / len(runtimes), min(runtimes), max(runtimes))
+        for rule, runtimes in self._rule_runtimes.items():
+            yield (rule, runtimes.mean, runtimes.min, runtimes.max)
 
     @property
     def file_stats(self):
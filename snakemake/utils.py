@@ -12,7 +12,6 @@ import textwrap
 import platform
 from itertools import chain
 import collections
-import multiprocessing
 import string
 import shlex
 import sys
@@ -513,6 +512,8 @@ def available_cpu_count():
 
     Adapted from https://stackoverflow.com/a/1006301/715090
     """
+    import multiprocessing
+
     try:
         with open("/proc/self/status") as f:
             status = f.read()
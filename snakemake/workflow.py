@@ -8,7 +8,6 @@ import os
 import sys
 import signal
 import json
-from tokenize import maybe
 import urllib
 from collections import OrderedDict, namedtuple
 from itertools import filterfalse, chain
@@ -57,6 +56,7 @@ from snakemake.io import (
     IOFile,
 )
 from snakemake.persistence import Persistence
+from snakemake.compilationcache import CompilationCache
 from snakemake.utils import update_config
 from snakemake.script import script
 from snakemake.notebook import notebook
@@ -154,7 +154,7 @@ class Workflow:
         self.global_resources["_cores"] = cores
         self.global_resources["_nodes"] = nodes
 
-        self._rules = OrderedDict()
+        self._rules = dict()
         self.first_rule = None
         self._workdir = None
         self.overwrite_workdir = overwrite_workdir
@@ -220,6 +220,9 @@ class Workflow:
         self.execute_subworkflows = execute_subworkflows
         self.modules = dict()
         self.sourcecache = SourceCache()
+        self.compilation_cache = CompilationCache(
+            os.path.abspath(os.path.join(".snakemake", "compiled-snakefiles"))
+        )
         self.scheduler_solver_path = scheduler_solver_path
         self._conda_base_path = conda_base_path
         self.check_envvars = check_envvars
@@ -457,6 +460,8 @@ class Workflow:
         """
         Add a rule.
         """
+        if name is not None:
+            name = sys.intern(name)
         is_overwrite = self.is_rule(name)
         if not allow_overwrite and is_overwrite:
             raise CreateRuleException(
@@ -468,7 +473,7 @@ class Workflow:
             self.rule_count += 1
         if not self.first_rule:
             self.first_rule = rule.name
-        return name
+        return rule
 
     def is_rule(self, name):
         """
@@ -488,7 +493,7 @@ class Workflow:
         """
         if not self._rules:
             raise NoRulesException()
-        if not name in self._rules:
+        if name not in self._rules:
             raise UnknownRuleException(name)
         return self._rules[name]
 
@@ -1165,30 +1170,36 @@ class Workflow:
         self.included_stack.append(snakefile)
 
         first_rule = self.first_rule
-        code, linemap, rulecount = parse(
-            snakefile,
-            self,
-            overwrite_shellcmd=self.overwrite_shellcmd,
-            rulecount=self._rulecount,
+        code, linemap, rulecount = self.compile_snakefile(
+            snakefile, print_compilation=print_compilation
         )
         self._rulecount = rulecount
 
-        if print_compilation:
-            print(code)
-
         if isinstance(snakefile, LocalSourceFile):
             # insert the current directory into sys.path
             # this allows to import modules from the workflow directory
-            sys.path.insert(0, snakefile.get_basedir().get_path_or_uri())
+            snakefile_dir = snakefile.get_basedir().get_path_or_uri()
+            # Move the directory to the front instead of adding it once per
+            # included snakefile. Only the first occurrence is relevant for
+            # imports, but every import has to look at each entry.
+            if snakefile_dir in sys.path:
+                sys.path.remove(snakefile_dir)
+            sys.path.insert(0, snakefile_dir)
 
         self.linemaps[snakefile.get_path_or_uri()] = linemap
 
-        exec(compile(code, snakefile.get_path_or_uri(), "exec"), self.globals)
+        exec(code, self.globals)
 
         if not overwrite_first_rule:
             self.first_rule = first_rule
         self.included_stack.pop()
 
+    def compile_snakefile(self, snakefile, print_compilation=False):
+        """Parse the given snakefile and compile it into a code object."""
+        return self.compilation_cache.compile(
+            snakefile, self, print_compilation=print_compilation
+        )
+
     def onstart(self, func):
         """Register onstart function."""
         self._onstart = func
@@ -1323,14 +1334,13 @@ class Workflow:
         orig_name = name
         name = self.modifier.modify_rulename(name)
 
-        name = self.add_rule(
+        rule = self.add_rule(
             name,
             lineno,
             snakefile,
             checkpoint,
             allow_overwrite=self.modifier.allow_rule_overwrite,
         )
-        rule = self.get_rule(name)
         rule.is_checkpoint = checkpoint
 
         def decorate(ruleinfo):
@@ -1350,12 +1360,13 @@ class Workflow:
                 self._rules[ruleinfo.name] = rule
                 name = rule.name
             rule.path_modifier = ruleinfo.path_modifier
-            if ruleinfo.input:
-                rule.set_input(*ruleinfo.input[0], **ruleinfo.input[1])
-            if ruleinfo.output:
-                rule.set_output(*ruleinfo.output[0], **ruleinfo.output[1])
-            if ruleinfo.params:
-                rule.set_params(*ruleinfo.params[0], **ruleinfo.params[1])
+            for setter, value in (
+                (rule.set_input, ruleinfo.input),
+                (rule.set_output, ruleinfo.output),
+                (rule.set_params, ruleinfo.params),
+            ):
+                if value:
+                    setter(*value[0], **value[1])
             # handle default resources
             if self.default_resources is not None:
                 rule.resources = copy.deepcopy(self.default_resources.parsed)
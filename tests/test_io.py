@@ -1,7 +1,10 @@
+import os
 from pathlib import PosixPath
 
-from snakemake.io import _wildcard_regex, expand
-from snakemake.exceptions import WildcardError
+import pytest
+
+from snakemake.io import _wildcard_regex, expand, IOCache, _IOFile
+from snakemake.exceptions import WildcardError, WorkflowError
 
 
 def test_wildcard_regex():
@@ -112,3 +115,62 @@ def test_expand():
         )
         == ["Hello/world"]
     )
+
+
+def test_stat_local_files(tmp_path):
+    def mtimes(mtime):
+        return (mtime.local(), mtime.local(follow_symlinks=True), mtime.remote())
+
+    (tmp_path / "file").write_text("")
+    os.utime(tmp_path / "file", (1, 1))
+    (tmp_path / "link").symlink_to(tmp_path / "file")
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / ".snakemake_timestamp").write_text("")
+    os.utime(tmp_path / "dir" / ".snakemake_timestamp", (2, 2))
+
+    files = [_IOFile(str(tmp_path / name)) for name in ("file", "link", "dir")]
+    assert [
+        (f, mtimes(mtime))
+        for f, mtime in IOCache._stat_local_files(str(tmp_path), files)
+    ] == [(f, mtimes(f.mtime_uncached)) for f in files]
+
+    # a failing stat raises the same error as mtime_uncached
+    missing = _IOFile(str(tmp_path / "missing"))
+    with pytest.raises(WorkflowError) as uncached:
+        missing.mtime_uncached
+    with pytest.raises(WorkflowError) as batched:
+        IOCache._stat_local_files(str(tmp_path), [missing])
+    assert str(batched.value) == str(uncached.value)
+
+
+def test_is_producer(tmp_path):
+    from snakemake.workflow import Workflow
+
+    snakefile = tmp_path / "Snakefile"
+    snakefile.write_text(
+        """
+rule repeated:
+    output: "{sample}/{sample}.txt"
+
+rule shared:
+    output: "{sample}.a", "{sample}.b"
+
+rule named_group:
+    output: "{sample,(?P<x>[a-z]+)}.c", "{sample}.d"
+"""
+    )
+    workflow = Workflow(snakefile=str(snakefile), overwrite_configfiles=[])
+    workflow.include(str(snakefile))
+
+    def producers(rule, requested):
+        # per product matching, as done without a combined regex
+        return [any(o.match(f) for o in rule.products) for f in requested]
+
+    requested = ["x/x.txt", "x/y.txt", "x.a", "x.b", "x.c", "1.c", "x.d", "x.e"]
+    for rule in workflow.rules:
+        assert [rule.is_producer(f) for f in requested] == producers(rule, requested)
+    assert workflow.get_rule("repeated")._products_regex
+    assert workflow.get_rule("shared")._products_regex
+    assert workflow.get_rule("named_group")._products_regex is False
+    assert workflow.get_rule("repeated").is_producer("x/x.txt")
+    assert not workflow.get_rule("repeated").is_producer("x/y.txt")
@@ -238,6 +238,61 @@ def test_ruledeps():
     run(dpath("test_ruledeps"))
 
 
+def test_ruledeps_ambiguity():
+    # a producer selected via an explicit rule dependency must not be reused
+    # for other jobs requesting the same file
+    run(dpath("test_ruledeps_ambiguity"), shouldfail=True)
+
+
+def test_ruledeps_ambiguity_ruleorder():
+    run(dpath("test_ruledeps_ambiguity"), snakefile="Snakefile_ruleorder")
+
+
+def _run_counting_evaluations(*args, **kwargs):
+    """Run the given test and count how often each rule's jobs are evaluated
+    while building the DAG."""
+    from unittest.mock import patch
+    from snakemake.dag import DAG
+
+    evaluated = []
+    update_ = DAG._update_
+
+    def counting_update_(self, job, *args, **kwargs):
+        evaluated.append(job.rule.name)
+        return update_(self, job, *args, **kwargs)
+
+    with patch.object(DAG, "_update_", counting_update_):
+        run(*args, **kwargs)
+    return evaluated
+
+
+def test_deep_dag():
+    run(dpath("test_deep_dag"), dryrun=True, targets=["s1000.txt"])
+
+
+def test_missing_input_cache():
+    evaluated = _run_counting_evaluations(dpath("test_missing_input_cache"))
+    # requested by left_base and right_base, but evaluated only once
+    assert evaluated.count("base") == 1
+    assert evaluated.count("mid") == 1
+
+
+def test_missing_input_cache_error():
+    messages = []
+    evaluated = _run_counting_evaluations(
+        dpath("test_missing_input_cache"),
+        snakefile="Snakefile_missing",
+        shouldfail=True,
+        log_handler=[messages.append],
+    )
+    assert evaluated.count("base") == 1
+    # the same error as without the cache
+    errors = [msg["msg"] for msg in messages if msg["level"] == "error"]
+    assert len(errors) == 1
+    assert errors[0].startswith("MissingInputException in line 47 of ")
+    assert "\nMissing input files for rule mid:\nmissing.txt" in errors[0]
+
+
 def test_persistent_dict():
     try:
         import pytools
@@ -1382,3 +1437,87 @@ def test_checkpoint_allowed_rules():
 @skip_on_windows
 def test_modules_ruledeps_inheritance():
     run(dpath("test_modules_ruledeps_inheritance"))
+
+
+def _compile_snakefile(workdir, **kwargs):
+    from snakemake.workflow import Workflow
+    from snakemake.sourcecache import infer_source_file
+
+    olddir = os.getcwd()
+    os.chdir(workdir)
+    try:
+        workflow = Workflow(snakefile="Snakefile", overwrite_configfiles=[])
+        return workflow.compile_snakefile(infer_source_file("Snakefile"), **kwargs)
+    finally:
+        os.chdir(olddir)
+
+
+def test_compilation_cache():
+    import marshal
+
+    tmpdir = tempfile.mkdtemp(prefix="snakemake-")
+    try:
+        snakefile = os.path.join(tmpdir, "Snakefile")
+        with open(snakefile, "w") as f:
+            f.write('rule a:\n    output: "a.txt"\n    shell: "touch {output}"\n')
+        code, linemap, rulecount = _compile_snakefile(tmpdir)
+        assert rulecount == 1
+
+        cachedir = os.path.join(tmpdir, ".snakemake", "compiled-snakefiles")
+        (entry,) = [os.path.join(cachedir, e) for e in os.listdir(cachedir)]
+        # replace the cached code, such that a cache hit can be recognized
+        with open(entry, "rb") as f:
+            key, _, linemap, rulecount = marshal.load(f)
+        cached_code = compile("cached = True", snakefile, "exec")
+        with open(entry, "wb") as f:
+            marshal.dump((key, cached_code, linemap, rulecount), f)
+
+        # hit
+        assert _compile_snakefile(tmpdir)[0] == cached_code
+        # bypassed when printing the compilation
+        assert _compile_snakefile(tmpdir, print_compilation=True)[0] == code
+        # miss after a content change, which replaces the outdated entry
+        with open(snakefile, "a") as f:
+            f.write('\nrule b:\n    output: "b.txt"\n    shell: "touch {output}"\n')
+        code, linemap, rulecount = _compile_snakefile(tmpdir)
+        assert code != cached_code
+        assert rulecount == 2
+        assert os.listdir(cachedir) == [os.path.basename(entry)]
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_compilation_cache_workdir():
+    tmpdir = tempfile.mkdtemp(prefix="snakemake-")
+    try:
+        with open(os.path.join(tmpdir, "Snakefile"), "w") as f:
+            f.write('workdir: "sub"\n\ninclude: "rules.smk"\n')
+        with open(os.path.join(tmpdir, "rules.smk"), "w") as f:
+            f.write('rule a:\n    output: "a.txt"\n    shell: "touch {output}"\n')
+        assert snakemake(os.path.join(tmpdir, "Snakefile"), workdir=tmpdir, dryrun=True)
+        # both snakefiles are cached in the initial working directory
+        cachedir = os.path.join(tmpdir, ".snakemake", "compiled-snakefiles")
+        assert len(os.listdir(cachedir)) == 2
+        assert not os.path.exists(
+            os.path.join(tmpdir, "sub", ".snakemake", "compiled-snakefiles")
+        )
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_compilation_cache_without_parser_source():
+    from unittest.mock import patch
+    from snakemake import parser
+    from snakemake.compilationcache import _parser_checksum
+
+    tmpdir = tempfile.mkdtemp(prefix="snakemake-")
+    _parser_checksum.cache_clear()
+    try:
+        with open(os.path.join(tmpdir, "Snakefile"), "w") as f:
+            f.write('rule a:\n    output: "a.txt"\n    shell: "touch {output}"\n')
+        with patch.object(parser, "__file__", tmpdir + "/missing.py"):
+            assert _compile_snakefile(tmpdir)[2] == 1
+        assert not os.path.exists(os.path.join(tmpdir, ".snakemake"))
+    finally:
+        _parser_checksum.cache_clear()
+        shutil.rmtree(tmpdir)